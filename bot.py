@@ -1,21 +1,42 @@
-import json
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from telegram import Update, InputFile
+from telegram import Update
 from telegram.ext import Application, MessageHandler, CommandHandler, ContextTypes, filters, Defaults
 from config import config
 from config.paths import *
-from filelock import FileLock
-from collections import deque
+from collections import deque, namedtuple, OrderedDict
+from itertools import islice
+import sys
 import threading
 import time
 import pytz
 from functools import lru_cache
 import shutil
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image, ImageDraw, ImageFont
 import io
+import asyncio
+import heapq
+import re
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson is much faster; fall back to the standard library if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+# Optional: compress JSON backups with zstd when available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Configure logging
 logging.basicConfig(
@@ -29,15 +50,46 @@ logging.getLogger('httpx').setLevel(logging.WARNING)
 logging.getLogger('telegram').setLevel(logging.WARNING)
 logging.getLogger('apscheduler').setLevel(logging.WARNING)
 logging.getLogger('asyncio').setLevel(logging.WARNING)
-logging.getLogger('filelock').setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
-# Message cache to track conversation flow
-message_cache = {}
+# Message cache to track conversation flow, oldest entries first
+MAX_MESSAGE_CACHE = 10_000
+message_cache = OrderedDict()
 response_buffer = deque(maxlen=100)  # Buffer for batch processing
-save_lock = FileLock(f"{RESPONSE_DATA_FILE}.lock")
-excel_lock = FileLock(f"{RESPONSE_TRACKING_FILE}.lock")
+buffer_lock = threading.Lock()  # Guards response_buffer between handlers and the save thread
+flush_condition = threading.Condition(buffer_lock)  # Wakes the save thread when responses arrive
+FLUSH_THRESHOLD = 50  # Save as soon as this many responses are buffered
+FLUSH_INTERVAL = 15  # Otherwise save at most this many seconds after the first buffered response
+# Only this process touches the data files, so in-process locks are enough.
+# Re-entrant because saves take the lock again inside create_backup/load_response_data.
+save_lock = threading.RLock()
+excel_lock = threading.RLock()
+
+# Worker threads for file and Excel I/O so handlers don't block the event loop
+io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='io')
+
+async def run_blocking(func, *args):
+    """Run a blocking function on the I/O executor and wait for its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, func, *args)
+
+# Admin/target list edits load, modify and save (off the event loop), so
+# commands take this lock to keep concurrent edits from overwriting each other
+user_lists_lock = asyncio.Lock()
+
+# In-memory copies of the user lists, reloaded only when the file changes
+_UserSetCache = namedtuple('_UserSetCache', ['stamp', 'data'])
+_user_set_cache = {}
+
+def file_stamp(path):
+    """(mtime_ns, size) identifying a file's current contents, or None if it doesn't exist"""
+    # Size is included because two writes within one mtime tick would otherwise look unchanged
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 # Cache timezone object to avoid repeated creation
 @lru_cache(maxsize=1)
@@ -62,92 +114,261 @@ def format_timestamp(dt):
     """Format timestamp consistently with timezone"""
     if not dt.tzinfo:
         dt = pytz.UTC.localize(dt)
-    tz = get_timezone()
-    local_dt = dt.astimezone(tz)
-    return local_dt.isoformat(timespec='seconds')
+    return format_timestamp_aware(dt, get_timezone())
+
+def format_timestamp_aware(dt, tz):
+    """Format an already timezone-aware timestamp in the given timezone"""
+    return dt.astimezone(tz).isoformat(timespec='seconds')
+
+def drain_response_buffer():
+    """Take everything out of the response buffer in one step"""
+    with buffer_lock:
+        snapshot = list(response_buffer)
+        response_buffer.clear()
+    return snapshot
+
+def buffer_response(response_info):
+    """Queue a response for the save thread"""
+    with flush_condition:
+        response_buffer.append(response_info)
+        # Wake the save thread to start its timer, or to save a full batch right away
+        if len(response_buffer) == 1 or len(response_buffer) >= FLUSH_THRESHOLD:
+            flush_condition.notify()
 
 def save_response_buffer():
-    """Periodically save buffered responses to disk"""
+    """Save buffered responses when a batch fills up or has waited FLUSH_INTERVAL seconds"""
     while True:
-        time.sleep(15)  # Save every 15 seconds instead of 60
-        if response_buffer:
-            try:
-                with save_lock:
-                    current_data = load_response_data()
-                    while response_buffer:
-                        current_data.append(response_buffer.popleft())
-                    save_response_data(current_data)
-                logger.info(f"Batch saved {len(current_data)} responses to JSON")
-            except Exception as e:
-                logger.error(f"Error in batch save: {e}")
+        with flush_condition:
+            # Sleep without polling until something is buffered
+            flush_condition.wait_for(lambda: response_buffer)
+            flush_condition.wait_for(lambda: len(response_buffer) >= FLUSH_THRESHOLD, timeout=FLUSH_INTERVAL)
+        try:
+            # Drain and append under save_lock so a stats rebuild never sees
+            # responses that are neither buffered nor in the file
+            with save_lock:
+                pending = drain_response_buffer()
+                if pending:
+                    append_response_data(pending)
+            if pending:
+                logger.info(f"Batch saved {len(pending)} responses to JSON")
+        except Exception as e:
+            logger.error(f"Error in batch save: {e}")
 
 # Start background save thread
 save_thread = threading.Thread(target=save_response_buffer, daemon=True)
 save_thread.start()
 
+def _dumps(obj, indent=False):
+    """Serialize an object to JSON bytes; compact unless indent is set for human-edited files"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, default=str, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _dumps_line(obj):
+    """Serialize an object as one newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return _dumps(obj) + b'\n'
+
+def _loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _atomic_write_json(path, obj, indent=False):
+    """Write an object to a JSON file via a synced temporary file and an atomic rename"""
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(_dumps(obj, indent))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+def _newest_entries(cache):
+    """The last MAX_MESSAGE_CACHE entries of an insertion-ordered mapping"""
+    return islice(cache.items(), max(len(cache) - MAX_MESSAGE_CACHE, 0), None)
+
 def load_message_cache():
     try:
-        with open(MESSAGE_CACHE_FILE, 'r') as f:
-            return json.load(f)
+        with open(MESSAGE_CACHE_FILE, 'rb') as f:
+            return OrderedDict(_newest_entries(_loads(f.read())))
     except FileNotFoundError:
-        return {}
+        return OrderedDict()
 
 def save_message_cache(cache):
-    with open(MESSAGE_CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=4)
+    _atomic_write_json(MESSAGE_CACHE_FILE, dict(_newest_entries(cache)))
+
+def _load_user_set(path, key):
+    """Load a user ID set from JSON, reusing the cached frozenset while the file is unchanged
+
+    Files are a plain list of IDs; the older {key: [...]} wrapper is still accepted.
+    """
+    stamp = file_stamp(path)
+    if stamp is None:
+        return frozenset()
+
+    cached = _user_set_cache.get(path)
+    if cached is not None and cached.stamp == stamp:
+        return cached.data
+
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    # Handle both old and new format
+    if isinstance(data, list):
+        users = frozenset(data)
+    elif isinstance(data, dict):
+        users = frozenset(data.get(key, []))
+    else:
+        users = frozenset()
+
+    _user_set_cache[path] = _UserSetCache(stamp, users)
+    return users
+
+def _save_user_set(path, users):
+    """Atomically write a user ID set as a sorted JSON list and refresh the cached copy"""
+    users = frozenset(users)
+    # These lists are small and edited by hand, so keep them readable
+    _atomic_write_json(path, sorted(users), indent=True)
+    _user_set_cache[path] = _UserSetCache(file_stamp(path), users)
 
 # Load target users from JSON
 def load_target_users():
     """Load target users from JSON file"""
-    try:
-        with open(TARGET_USERS_FILE, 'r') as f:
-            data = json.load(f)
-            # Handle both old and new format
-            if isinstance(data, dict) and 'target_users' in data:
-                return set(data['target_users'])
-            elif isinstance(data, list):
-                return set(data)
-            return set()
-    except FileNotFoundError:
-        return set()
+    return _load_user_set(TARGET_USERS_FILE, 'target_users')
 
 # Save target users to JSON
 def save_target_users(target_users):
     """Save target users to JSON file"""
-    with open(TARGET_USERS_FILE, 'w') as f:
-        json.dump({'target_users': list(target_users)}, f, indent=4)
+    _save_user_set(TARGET_USERS_FILE, target_users)
     logger.debug(f"Updated target users list (count: {len(target_users)})")
 
-@lru_cache(maxsize=1)
-def load_response_data():
-    """Load response data with caching"""
+# Parsed response data, keyed by the file stamp it was read at (None = no file)
+_response_data_cache = {'stamp': None, 'data': []}
+
+# Python 3.11+ parses a trailing 'Z' itself; older versions need it rewritten as an offset
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _upgrade_record(record):
+    """Convert a record saved with ISO timestamp strings to epoch seconds"""
+    if 'response_ts' not in record:
+        response_time = _parse_iso(record.pop('response_time'))
+        question_time = _parse_iso(record.pop('question_time'))
+        record['response_ts'] = int(response_time.timestamp())
+        record['question_ts'] = int(question_time.timestamp())
+        record.pop('response_delay_seconds', None)
+    return record
+
+def response_delay(record):
+    """Seconds between the original message and the response"""
+    return record['response_ts'] - record['question_ts']
+
+def _journal_records(f):
+    """Parse JSON lines, skipping any that are malformed (e.g. an append cut short by a crash)"""
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield _loads(line)
+        except ValueError:
+            logger.warning(f"Skipping malformed line {line_number} in {RESPONSE_DATA_FILE}")
+
+def iter_response_data():
+    """Stream records from the response data file one line at a time"""
     try:
-        with save_lock:
-            with open(RESPONSE_DATA_FILE, 'r') as f:
-                return json.load(f)
+        with open(RESPONSE_DATA_FILE, 'rb') as f:
+            # Older versions stored a single pretty-printed array
+            if f.read(1) == b'[':
+                f.seek(0)
+                records = _loads(f.read())
+            else:
+                f.seek(0)
+                records = _journal_records(f)
+            for record in records:
+                yield _upgrade_record(record)
     except FileNotFoundError:
-        return []
+        return
+
+def _read_response_data():
+    """Parse the whole response data file"""
+    return list(iter_response_data())
+
+def load_response_data():
+    """Load response data with caching; returns a copy callers may modify"""
+    with save_lock:
+        stamp = file_stamp(RESPONSE_DATA_FILE)
+        if _response_data_cache['stamp'] != stamp:
+            _response_data_cache['data'] = _read_response_data()
+            _response_data_cache['stamp'] = stamp
+        return list(_response_data_cache['data'])
+
+def _encode_response_lines(records):
+    """Serialize response records as JSON lines"""
+    return b''.join(_dumps_line(r) for r in records)
+
+def snapshot_file(src, dst):
+    """Hardlink src to dst, falling back to a copy (e.g. across filesystems)"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+BACKUP_COMPRESSION_LEVEL = 3  # zstd level; fast enough to run under save_lock
+# One reusable compressor; only used under save_lock, so never concurrently
+backup_compressor = zstandard.ZstdCompressor(level=BACKUP_COMPRESSION_LEVEL) if zstandard is not None else None
+
+def compress_file(src, dst):
+    """Write a zstd-compressed copy of src to dst"""
+    with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+        backup_compressor.copy_stream(f_in, f_out)
+
+def backup_type(file_name):
+    """The backup kind ('.json' or '.xlsx') of a file in BACKUP_DIR, ignoring a .zst suffix"""
+    if file_name.endswith('.zst'):
+        file_name = file_name[:-len('.zst')]
+    file_type = os.path.splitext(file_name)[1]
+    return file_type if file_type in ('.json', '.xlsx') else None
+
+def scan_backups():
+    """List (name, mtime) pairs for each backup type in a single directory scan"""
+    backups = {'.json': [], '.xlsx': []}
+    with os.scandir(BACKUP_DIR) as entries:
+        for entry in entries:
+            file_type = backup_type(entry.name)
+            if file_type is not None and entry.is_file():
+                # scandir entries carry their stat info, so no extra getmtime() per file
+                backups[file_type].append((entry.name, entry.stat().st_mtime))
+    return backups
 
 def create_backup():
     """Create a backup of the response data file"""
     try:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Backup JSON data
+        # Backup JSON data (copied, since new responses are appended to the same file)
         json_backup = os.path.join(BACKUP_DIR, f'response_data_{timestamp}.json')
         with save_lock:
-            shutil.copy2(RESPONSE_DATA_FILE, json_backup)
+            if backup_compressor is not None:
+                compress_file(RESPONSE_DATA_FILE, f'{json_backup}.zst')
+            else:
+                shutil.copy2(RESPONSE_DATA_FILE, json_backup)
             
-        # Backup Excel if exists
+        # Backup Excel if exists; the report is only ever replaced, never
+        # modified in place, so a hardlink is a safe snapshot (and .xlsx is
+        # already zip-compressed)
         if os.path.exists(RESPONSE_TRACKING_FILE):
             with excel_lock:
                 excel_backup = os.path.join(BACKUP_DIR, f'response_tracking_{timestamp}.xlsx')
-                shutil.copy2(RESPONSE_TRACKING_FILE, excel_backup)
+                snapshot_file(RESPONSE_TRACKING_FILE, excel_backup)
         
         # Manage backups based on age and minimum count
-        for file_type in ['.json', '.xlsx']:
-            files = [(f, os.path.getmtime(os.path.join(BACKUP_DIR, f))) 
-                    for f in os.listdir(BACKUP_DIR) if f.endswith(file_type)]
+        for file_type, files in scan_backups().items():
             # Sort by modification time, newest first
             files.sort(key=lambda x: x[1], reverse=True)
             
@@ -175,45 +396,160 @@ def create_backup():
         logger.error(f"Backup failed: {str(e)}")
         return False
 
-def save_response_data(data):
-    """Save response data with backup"""
+_saves_since_backup = 0
+
+def append_response_data(records):
+    """Append new responses to the data file with periodic backup"""
+    global _saves_since_backup
+    if not records:
+        return
+
+    with save_lock:
+        previous_stamp = file_stamp(RESPONSE_DATA_FILE)
+
+        # Only the new records are written; the existing file is left untouched
+        with open(RESPONSE_DATA_FILE, 'ab+') as f:
+            # If a crash left a torn last line, start on a fresh one so the
+            # first new record isn't glued onto the fragment
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(_encode_response_lines(records))
+
+        # Keep the cached data in step instead of re-reading the whole file
+        if _response_data_cache['stamp'] == previous_stamp:
+            _response_data_cache['data'].extend(records)
+            _response_data_cache['stamp'] = file_stamp(RESPONSE_DATA_FILE)
+
+        # Create more frequent backups (every 20 saves instead of 100)
+        _saves_since_backup += 1
+        if _saves_since_backup >= config.BACKUP_INTERVAL:
+            _saves_since_backup = 0
+            create_backup()
+            logger.info(f"Created periodic backup (appended responses: {len(records)})")
+        else:
+            logger.debug(f"Appended responses to file (count: {len(records)})")
+
+def save_response_data(records):
+    """Rewrite the whole response data file (used for compaction); returns the record count"""
     with save_lock:
-        # First save to a temporary file
+        # First save to a temporary file, one record at a time so any iterable can be streamed
         temp_file = f"{RESPONSE_DATA_FILE}.tmp"
-        with open(temp_file, 'w') as f:
-            json.dump(data, f, indent=4, default=str)
+        count = 0
+        with open(temp_file, 'wb') as f:
+            for record in records:
+                f.write(_dumps_line(record))
+                count += 1
+            # Compaction is where appended data becomes durable, so sync before the swap
+            f.flush()
+            os.fsync(f.fileno())
         
         # Then rename it to the actual file (atomic operation)
         os.replace(temp_file, RESPONSE_DATA_FILE)
         
-        # Clear the cache to force reload on next access
-        load_response_data.cache_clear()
-        
-        # Create more frequent backups (every 20 saves instead of 100)
-        if len(data) % config.BACKUP_INTERVAL == 0:
-            create_backup()
-            logger.info(f"Created periodic backup (total responses: {len(data)})")
-        else:
-            logger.debug(f"Saved responses to file (count: {len(data)})")
-
-# Initialize data
-response_data = load_response_data()
+        # Reset the cache; the new contents are read back on next access
+        _response_data_cache['data'] = []
+        _response_data_cache['stamp'] = None
+        logger.debug(f"Rewrote response data file (count: {count})")
+        return count
+
+def migrate_response_data():
+    """Rewrite a legacy data file (JSON array or ISO timestamps) in the current format"""
+    try:
+        with open(RESPONSE_DATA_FILE, 'rb') as f:
+            first_line = f.readline()
+    except FileNotFoundError:
+        return
+    is_legacy = first_line.startswith(b'[') or (first_line.strip() and b'"response_ts"' not in first_line)
+    if is_legacy:
+        with save_lock:
+            # The conversion drops the original ISO strings, so keep a copy first
+            if not create_backup():
+                logger.error("Backup failed; leaving the legacy response data file unconverted")
+                return
+            count = save_response_data(iter_response_data())
+        logger.info(f"Converted response data file to the current format ({count} responses)")
+
+# Running per-user statistics, so stats/debug/chart don't rescan the whole history
+stats_lock = threading.Lock()
+response_stats = {}  # user_id -> {'user_name', 'count', 'total_delay', 'today_count', 'today_date'}
+response_totals = {'count': 0, 'total_delay': 0.0}
+
+def _response_date(record):
+    """Local date of a response record"""
+    return datetime.fromtimestamp(record['response_ts'], get_timezone()).date()
+
+def _add_to_stats(record, stats, totals):
+    delay = response_delay(record)
+    day = _response_date(record)
+    entry = stats.get(record['user_id'])
+    if entry is None:
+        entry = stats[record['user_id']] = {
+            'user_name': record['user_name'],
+            'count': 0,
+            'total_delay': 0.0,
+            'today_count': 0,
+            'today_date': day
+        }
+    entry['count'] += 1
+    entry['total_delay'] += delay
+    # Only the most recent day is counted; older days are never asked for
+    if day > entry['today_date']:
+        entry['today_date'] = day
+        entry['today_count'] = 1
+    elif day == entry['today_date']:
+        entry['today_count'] += 1
+    totals['count'] += 1
+    totals['total_delay'] += delay
+
+def track_response(record):
+    """Buffer a new response for saving and fold it into the running statistics"""
+    # Both happen under stats_lock, so a rebuild counts the record exactly once
+    with stats_lock:
+        buffer_response(record)
+        _add_to_stats(record, response_stats, response_totals)
+
+def rebuild_response_stats(data):
+    """Recompute the running statistics from saved data plus pending responses"""
+    # Callers hold save_lock so nothing moves from the buffer to the file meanwhile.
+    # The saved data is tallied without stats_lock, so tracking new responses
+    # isn't held up while the whole file is read
+    stats = {}
+    totals = {'count': 0, 'total_delay': 0.0}
+    for record in data:
+        _add_to_stats(record, stats, totals)
+    
+    with stats_lock:
+        with buffer_lock:
+            pending = list(response_buffer)
+        for record in pending:
+            _add_to_stats(record, stats, totals)
+        response_stats.clear()
+        response_stats.update(stats)
+        response_totals.update(totals)
+
+def get_response_stats():
+    """Snapshot of the per-user statistics and overall totals"""
+    with stats_lock:
+        return {uid: dict(entry) for uid, entry in response_stats.items()}, dict(response_totals)
+
+# Initialize data; statistics are built by streaming the file, so the full
+# history is only held in memory once a command actually needs it
+migrate_response_data()
+with save_lock:
+    rebuild_response_stats(iter_response_data())
 message_cache = load_message_cache()
-logger.info(f"Bot started with {len(response_data)} existing responses and {len(message_cache)} cached messages")
+logger.info(f"Bot started with {response_totals['count']} existing responses and {len(message_cache)} cached messages")
 
 def load_admin_users():
     """Load admin users from JSON file"""
-    try:
-        with open(ADMIN_USERS_FILE, 'r') as f:
-            data = json.load(f)
-            return set(data.get('admin_users', []))
-    except FileNotFoundError:
-        return set()
+    return _load_user_set(ADMIN_USERS_FILE, 'admin_users')
 
 def save_admin_users(admin_users):
     """Save admin users to JSON file"""
-    with open(ADMIN_USERS_FILE, 'w') as f:
-        json.dump({'admin_users': list(admin_users)}, f, indent=4)
+    _save_user_set(ADMIN_USERS_FILE, admin_users)
     logger.info(f"Saved admin users: {admin_users}")
 
 async def check_admin(update: Update) -> bool:
@@ -247,6 +583,19 @@ async def get_my_id(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.info(f"User ID request: {user_info}")
     await update.message.reply_text(user_info)
 
+USER_ID_PATTERN = re.compile(r'-?\d+')
+
+def parse_user_ids(args):
+    """Split command arguments into unique user IDs (in argument order) and any invalid ones"""
+    user_ids = []
+    invalid = []
+    for arg in args:
+        if USER_ID_PATTERN.fullmatch(arg):
+            user_ids.append(int(arg))
+        else:
+            invalid.append(arg)
+    return list(dict.fromkeys(user_ids)), invalid
+
 async def add_target_user(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Add a user to the tracking list"""
     if not await check_admin(update):
@@ -256,25 +605,32 @@ async def add_target_user(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Please provide a user ID to add.")
         return
 
-    try:
-        user_id = int(context.args[0])
+    user_ids, invalid = parse_user_ids(context.args)
+    if invalid:
+        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        return
+
+    async with user_lists_lock:
         target_users = load_target_users()
         admin_users = load_admin_users()
         
-        if user_id in admin_users:
-            await update.message.reply_text(f"⚠️ User {user_id} is an admin and already has all permissions.")
-            return
-            
-        if user_id in target_users:
-            await update.message.reply_text(f"User {user_id} is already in tracking list.")
-            return
-            
-        target_users.add(user_id)
-        save_target_users(target_users)
-        logger.info(f"Added user {user_id} to tracking list")
-        await update.message.reply_text(f"✅ User {user_id} added to tracking list.")
-    except ValueError:
-        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        replies = []
+        added = []
+        for user_id in user_ids:
+            if user_id in admin_users:
+                replies.append(f"⚠️ User {user_id} is an admin and already has all permissions.")
+            elif user_id in target_users:
+                replies.append(f"User {user_id} is already in tracking list.")
+            else:
+                added.append(user_id)
+                replies.append(f"✅ User {user_id} added to tracking list.")
+        
+        # All IDs are saved in a single write
+        if added:
+            await run_blocking(save_target_users, target_users | set(added))
+            logger.info(f"Added users {added} to tracking list")
+    
+    await update.message.reply_text("\n".join(replies))
 
 async def remove_target_user(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Remove a user from the tracking list"""
@@ -285,20 +641,50 @@ async def remove_target_user(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text("Please provide a user ID to remove.")
         return
 
-    try:
-        user_id = int(context.args[0])
+    user_ids, invalid = parse_user_ids(context.args)
+    if invalid:
+        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        return
+
+    async with user_lists_lock:
         target_users = load_target_users()
         
-        if user_id not in target_users:
-            await update.message.reply_text(f"❌ User {user_id} not found in tracking list.")
-            return
-            
-        target_users.remove(user_id)
-        save_target_users(target_users)
-        logger.info(f"Removed user {user_id} from tracking list")
-        await update.message.reply_text(f"✅ User {user_id} removed from tracking list.")
-    except ValueError:
-        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        replies = []
+        removed = []
+        for user_id in user_ids:
+            if user_id not in target_users:
+                replies.append(f"❌ User {user_id} not found in tracking list.")
+            else:
+                removed.append(user_id)
+                replies.append(f"✅ User {user_id} removed from tracking list.")
+        
+        if removed:
+            await run_blocking(save_target_users, target_users - set(removed))
+            logger.info(f"Removed users {removed} from tracking list")
+    
+    await update.message.reply_text("\n".join(replies))
+
+MEMBER_LOOKUP_CONCURRENCY = 10  # Parallel get_chat_member calls, kept low for Telegram rate limits
+
+async def describe_chat_members(context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_ids: list) -> list:
+    """Format a '• id (username)' line per user, looking the users up concurrently"""
+    semaphore = asyncio.Semaphore(MEMBER_LOOKUP_CONCURRENCY)
+
+    async def get_member(user_id):
+        async with semaphore:
+            return await context.bot.get_chat_member(chat_id, user_id)
+
+    members = await asyncio.gather(*(get_member(user_id) for user_id in user_ids), return_exceptions=True)
+
+    lines = []
+    for user_id, chat_member in zip(user_ids, members):
+        if isinstance(chat_member, Exception):
+            # If can't get user info, just show ID
+            lines.append(f"• {user_id}")
+        else:
+            username = f"@{chat_member.user.username}" if chat_member.user.username else chat_member.user.full_name
+            lines.append(f"• {user_id} ({username})")
+    return lines
 
 async def list_target_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """List all users being tracked"""
@@ -313,16 +699,7 @@ async def list_target_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
         
     # Format the user list with usernames if available
-    user_list = []
-    for user_id in sorted(target_users):
-        try:
-            # Try to get user info from chat member
-            chat_member = await context.bot.get_chat_member(update.effective_chat.id, user_id)
-            username = f"@{chat_member.user.username}" if chat_member.user.username else chat_member.user.full_name
-            user_list.append(f"• {user_id} ({username})")
-        except Exception:
-            # If can't get user info, just show ID
-            user_list.append(f"• {user_id}")
+    user_list = await describe_chat_members(context, update.effective_chat.id, sorted(target_users))
     
     users_text = "\n".join(user_list)
     message = f"📋 Currently tracking these users:\n{users_text}"
@@ -406,44 +783,42 @@ def inspect_message(message):
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     message = update.message
-    user_id = message.from_user.id
-    
+
     # Basic validation
     if not message or not message.from_user:
         logger.warning("Invalid message received")
         return
 
+    user_id = message.from_user.id
+
     try:
-        # Check if user is in target list
-        target_users = load_target_users()
-        if user_id not in target_users:
+        # Only replies can be responses; skip everything else before any lookups
+        if message.reply_to_message is None:
             return
 
-        if not message.reply_to_message:
+        # Check if user is in target list
+        if user_id not in load_target_users():
             return
 
-        # Get reply information with efficient timezone handling
+        # Times are stored as epoch seconds and only formatted for display;
+        # the delay is derived from them rather than stored
         original_message = message.reply_to_message
-        tz = get_timezone()
-        response_time = get_current_time()
-        question_time = original_message.date.astimezone(tz)
         
         response_info = {
             'user_id': user_id,
             'user_name': message.from_user.username or 'Unknown',
-            'response_time': format_timestamp(response_time),
+            'response_ts': int(time.time()),
             'response_text': message.text,
             'chat_id': message.chat_id,
-            'question_time': format_timestamp(question_time),
+            'question_ts': int(original_message.date.timestamp()),
             'question_text': original_message.text,
             'original_message_id': original_message.message_id,
             'original_sender_id': original_message.from_user.id if original_message.from_user else None,
-            'original_sender_username': original_message.from_user.username if original_message.from_user else None,
-            'response_delay_seconds': (response_time - question_time).total_seconds()
+            'original_sender_username': original_message.from_user.username if original_message.from_user else None
         }
         
         # Add to buffer
-        response_buffer.append(response_info)
+        track_response(response_info)
         
         # Log concise tracking info
         logger.debug(f"Response tracked: User {user_id} -> Msg {original_message.message_id}")
@@ -455,6 +830,95 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if user_id in admin_users:
             await update.message.reply_text("❌ Error processing message. Please check logs.")
 
+def write_excel_report(data):
+    """Write response data to the formatted Excel report"""
+    tz = get_timezone()
+
+    def column(key):
+        return [r.get(key) for r in data]
+
+    def local_time(key):
+        return (
+            pd.to_datetime(column(key), unit='s', utc=True)
+            .tz_convert(tz)
+            .strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+    delays = np.subtract(column('response_ts'), column('question_ts'), dtype=float)
+
+    # Build the DataFrame once, with readable column names already in display order
+    df = pd.DataFrame({
+        'Response Time': local_time('response_ts'),
+        'Responder Username': column('user_name'),
+        'Responder ID': column('user_id'),
+        'Response Message': column('response_text'),
+        'Original Message Time': local_time('question_ts'),
+        'Original Sender Username': column('original_sender_username'),
+        'Original Sender ID': column('original_sender_id'),
+        'Original Message': column('question_text'),
+        'Response Delay (seconds)': delays.round(2),
+        'Response Delay (minutes)': np.divide(delays, 60).round(2),
+        'Response Delay (hours)': np.divide(delays, 3600).round(2),
+        'Chat ID': column('chat_id'),
+        'Original Message ID': column('original_message_id')
+    })
+
+    # Write to a temporary file first so the report is replaced atomically
+    # (backups hardlink the report, so it must never be rewritten in place)
+    base, ext = os.path.splitext(RESPONSE_TRACKING_FILE)
+    temp_file = f"{base}.tmp{ext}"
+
+    # Create Excel writer with xlsxwriter engine for better formatting
+    with excel_lock:
+        with pd.ExcelWriter(temp_file, engine='xlsxwriter') as writer:
+            df.to_excel(writer, sheet_name='Response Data', index=False)
+
+            # Get workbook and worksheet objects for formatting
+            workbook = writer.book
+            worksheet = writer.sheets['Response Data']
+
+            # Define formats
+            header_format = workbook.add_format({
+                'bold': True,
+                'bg_color': '#D9E1F2',
+                'border': 1,
+                'text_wrap': True,
+                'valign': 'vcenter',
+                'align': 'center'
+            })
+
+            cell_format = workbook.add_format({
+                'text_wrap': True,
+                'valign': 'vcenter',
+                'align': 'left',
+                'border': 1
+            })
+
+            # Set column widths (longest cell or header, capped) and apply formats
+            header_lengths = pd.Series([len(str(col)) for col in df.columns], index=df.columns)
+            cell_lengths = df.astype(str).apply(lambda series: series.str.len().max())
+            widths = (cell_lengths.clip(lower=header_lengths) + 2).clip(upper=50)
+            for idx, width in enumerate(widths):
+                worksheet.set_column(idx, idx, int(width), cell_format)
+
+            # Apply header format
+            for col_num, value in enumerate(df.columns.values):
+                worksheet.write(0, col_num, value, header_format)
+
+            # Freeze the header row
+            worksheet.freeze_panes(1, 0)
+
+            # Add autofilter
+            worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+
+        os.replace(temp_file, RESPONSE_TRACKING_FILE)
+
+def flush_pending_responses():
+    """Save any buffered responses and return the full response data"""
+    with save_lock:
+        append_response_data(drain_response_buffer())
+        return load_response_data()
+
 async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Export response data to Excel with enhanced formatting"""
     if not await check_admin(update):
@@ -462,11 +926,7 @@ async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # First ensure any pending responses are saved
     try:
-        with save_lock:
-            current_data = load_response_data()
-            while response_buffer:
-                current_data.append(response_buffer.popleft())
-            save_response_data(current_data)
+        current_data = await run_blocking(flush_pending_responses)
     except Exception as e:
         logger.error(f"Pre-export save failed: {str(e)}")
         await update.message.reply_text("❌ Error saving pending responses before export.")
@@ -478,104 +938,7 @@ async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     try:
-        # Create DataFrame with better column names and organization
-        df = pd.DataFrame(current_data)
-        
-        # Rename columns for better readability
-        column_mapping = {
-            'user_id': 'Responder ID',
-            'user_name': 'Responder Username',
-            'response_time': 'Response Time',
-            'response_text': 'Response Message',
-            'chat_id': 'Chat ID',
-            'question_time': 'Original Message Time',
-            'question_text': 'Original Message',
-            'original_message_id': 'Original Message ID',
-            'original_sender_id': 'Original Sender ID',
-            'original_sender_username': 'Original Sender Username',
-            'response_delay_seconds': 'Response Delay (seconds)'
-        }
-        df = df.rename(columns=column_mapping)
-        
-        # Add calculated columns
-        df['Response Delay (minutes)'] = df['Response Delay (seconds)'] / 60
-        df['Response Delay (hours)'] = df['Response Delay (seconds)'] / 3600
-        
-        # Convert timestamp columns to datetime
-        for col in ['Response Time', 'Original Message Time']:
-            df[col] = pd.to_datetime(df[col])
-        
-        # Format timestamp columns
-        df['Response Time'] = df['Response Time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        df['Original Message Time'] = df['Original Message Time'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Round delay columns
-        df['Response Delay (seconds)'] = df['Response Delay (seconds)'].round(2)
-        df['Response Delay (minutes)'] = df['Response Delay (minutes)'].round(2)
-        df['Response Delay (hours)'] = df['Response Delay (hours)'].round(2)
-        
-        # Reorder columns for better readability
-        column_order = [
-            'Response Time',
-            'Responder Username',
-            'Responder ID',
-            'Response Message',
-            'Original Message Time',
-            'Original Sender Username',
-            'Original Sender ID',
-            'Original Message',
-            'Response Delay (seconds)',
-            'Response Delay (minutes)',
-            'Response Delay (hours)',
-            'Chat ID',
-            'Original Message ID'
-        ]
-        df = df[column_order]
-        
-        # Create Excel writer with xlsxwriter engine for better formatting
-        with excel_lock:
-            with pd.ExcelWriter(RESPONSE_TRACKING_FILE, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='Response Data', index=False)
-                
-                # Get workbook and worksheet objects for formatting
-                workbook = writer.book
-                worksheet = writer.sheets['Response Data']
-                
-                # Define formats
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'bg_color': '#D9E1F2',
-                    'border': 1,
-                    'text_wrap': True,
-                    'valign': 'vcenter',
-                    'align': 'center'
-                })
-                
-                cell_format = workbook.add_format({
-                    'text_wrap': True,
-                    'valign': 'vcenter',
-                    'align': 'left',
-                    'border': 1
-                })
-                
-                # Set column widths and apply formats
-                for idx, col in enumerate(df.columns):
-                    series = df[col]
-                    max_len = max(
-                        series.astype(str).apply(len).max(),
-                        len(str(col))
-                    ) + 2
-                    worksheet.set_column(idx, idx, min(max_len, 50), cell_format)
-                
-                # Apply header format
-                for col_num, value in enumerate(df.columns.values):
-                    worksheet.write(0, col_num, value, header_format)
-                
-                # Freeze the header row
-                worksheet.freeze_panes(1, 0)
-                
-                # Add autofilter
-                worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+        await run_blocking(write_excel_report, current_data)
         
         logger.info(f"Exported {len(current_data)} responses to Excel")
         await update.message.reply_text(
@@ -619,7 +982,7 @@ async def debug(update: Update, context: ContextTypes.DEFAULT_TYPE):
         roles.append("Worker")
     debug_text.extend([
         f"\n🎭 Your Roles: {', '.join(roles)}",
-        f"• Permissions: {', '.join(get_user_permissions(user_id))}"
+        f"• Permissions: {', '.join(get_user_permissions(user_id, admin_users, target_users))}"
     ])
 
     # Message context
@@ -635,33 +998,34 @@ async def debug(update: Update, context: ContextTypes.DEFAULT_TYPE):
         ])
 
     # Statistics if available
-    try:
-        with open(RESPONSE_DATA_FILE, 'r') as f:
-            response_data = json.load(f)
-            user_responses = [r for r in response_data if r['user_id'] == user_id]
-            if user_responses:
-                avg_response_time = sum(float(r['response_delay_seconds']) for r in user_responses) / len(user_responses)
-                debug_text.extend([
-                    f"\n📊 Your Statistics:",
-                    f"• Total responses: {len(user_responses)}",
-                    f"• Average response time: {format_time_delta(avg_response_time)}"
-                ])
-    except (FileNotFoundError, json.JSONDecodeError, KeyError):
-        pass
+    user_stats = get_response_stats()[0].get(user_id)
+    if user_stats:
+        avg_response_time = user_stats['total_delay'] / user_stats['count']
+        debug_text.extend([
+            f"\n📊 Your Statistics:",
+            f"• Total responses: {user_stats['count']}",
+            f"• Average response time: {format_time_delta(avg_response_time)}"
+        ])
 
     await update.message.reply_text("\n".join(debug_text))
 
-def get_user_permissions(user_id: int) -> list:
-    """Get list of permissions for a user"""
+def get_user_permissions(user_id: int, admin_users=None, target_users=None) -> list:
+    """Get list of permissions for a user (pass already-loaded user sets to skip reloading)"""
+    if admin_users is None:
+        admin_users = load_admin_users()
+    if target_users is None:
+        target_users = load_target_users()
+    is_admin = user_id in admin_users
+    
     permissions = ["View own stats"]
-    if user_id in load_admin_users():
+    if is_admin:
         permissions.extend([
             "Manage users",
             "Export data",
             "View all stats",
             "Manage admins"
         ])
-    if user_id in load_target_users() or user_id in load_admin_users():
+    if is_admin or user_id in target_users:
         permissions.extend([
             "Debug access",
             "Response tracking"
@@ -685,46 +1049,44 @@ async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     is_admin = user_id in load_admin_users()
     
     try:
-        with open(RESPONSE_DATA_FILE, 'r') as f:
-            response_data = json.load(f)
-            
         if not is_admin and user_id not in load_target_users():
             await update.message.reply_text("❌ You don't have permission to view statistics.")
             return
             
+        user_stats, totals = get_response_stats()
+        
         # Filter data based on permissions
         if is_admin:
-            data_to_analyze = response_data
+            entries = list(user_stats.values())
+            total_responses = totals['count']
+            total_delay = totals['total_delay']
             title = "📊 Overall Statistics:"
         else:
-            data_to_analyze = [r for r in response_data if r['user_id'] == user_id]
+            entries = [user_stats[user_id]] if user_id in user_stats else []
+            total_responses = sum(e['count'] for e in entries)
+            total_delay = sum(e['total_delay'] for e in entries)
             title = "📊 Your Statistics:"
             
-        if not data_to_analyze:
+        if not total_responses:
             await update.message.reply_text("No response data available.")
             return
             
         # Calculate statistics
-        total_responses = len(data_to_analyze)
-        avg_response_time = sum(float(r['response_delay_seconds']) for r in data_to_analyze) / total_responses
-        
-        # Group by date
-        today = datetime.now().date()
-        today_responses = [r for r in data_to_analyze 
-                         if datetime.fromisoformat(r['response_time'].replace('Z', '+00:00')).date() == today]
+        avg_response_time = total_delay / total_responses
+        today = get_current_time().date()
+        today_responses = sum(e['today_count'] for e in entries if e['today_date'] == today)
         
         stats_text = [
             title,
             f"• Total responses: {total_responses}",
             f"• Average response time: {format_time_delta(avg_response_time)}",
-            f"• Responses today: {len(today_responses)}"
+            f"• Responses today: {today_responses}"
         ]
         
         if is_admin:
-            unique_workers = len(set(r['user_id'] for r in data_to_analyze))
             stats_text.extend([
-                f"• Active workers: {unique_workers}",
-                f"• Total tracked messages: {len(response_data)}"
+                f"• Active workers: {len(entries)}",
+                f"• Total tracked messages: {totals['count']}"
             ])
             
         await update.message.reply_text("\n".join(stats_text))
@@ -733,6 +1095,86 @@ async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
         logger.error(f"Error generating stats: {str(e)}")
         await update.message.reply_text("❌ Error generating statistics. Please try again later.")
 
+def daily_average_minutes(records, start_date, end_date):
+    """Average response time in minutes per local day in [start_date, end_date], 0 for days without responses"""
+    frame = pd.DataFrame(records, columns=['response_ts', 'question_ts'])
+    days = pd.to_datetime(frame['response_ts'], unit='s', utc=True).dt.tz_convert(get_timezone()).dt.date
+    delays = (frame['response_ts'] - frame['question_ts']).astype('float64')
+    daily = delays.groupby(days).mean().reindex(pd.date_range(start_date, end_date).date, fill_value=0)
+    return daily / 60  # Convert to minutes
+
+# Telegram downsizes photos anyway, so a high DPI only costs render and encode time
+CHART_DPI = 100
+CHART_PNG_OPTIONS = {'compress_level': 3}  # Passed to Pillow; much faster than the default level
+
+def _create_chart(figsize):
+    """Create a reusable figure and axes on an Agg canvas"""
+    fig = Figure(figsize=figsize, layout='constrained')
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+# Charts redraw one long-lived figure per layout instead of building a new one
+# each time; the lock keeps concurrent renders off the same figure
+chart_lock = threading.Lock()
+overview_chart = _create_chart((12, 6))
+
+def render_chart_png(chart, labels, values, color, title, xlabel) -> bytes:
+    """Draw a bar chart of average response times on a shared figure and return PNG bytes"""
+    fig, ax = chart
+    buf = io.BytesIO()
+    with chart_lock:
+        ax.clear()
+        ax.bar(labels, values, color=color)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel('Average Response Time (minutes)')
+        ax.set_xticks(range(len(labels)), labels=labels, rotation=45, ha='right')
+        fig.savefig(buf, format='png', dpi=CHART_DPI, pil_kwargs=CHART_PNG_OPTIONS)
+    return buf.getvalue()
+
+# The 7-day worker chart is a handful of bars, drawn directly with Pillow
+# rather than going through matplotlib's layout and Agg pipeline
+BAR_CHART_SIZE = (800, 400)
+BAR_CHART_MARGINS = (70, 20, 40, 50)  # left, right, top, bottom
+bar_chart_font = ImageFont.load_default(size=13)
+bar_chart_title_font = ImageFont.load_default(size=18)
+
+def _render_bar_png(labels, values, color, title, xlabel) -> bytes:
+    """Draw a bar chart of average response times with Pillow and return PNG bytes"""
+    width, height = BAR_CHART_SIZE
+    left, right, top, bottom = BAR_CHART_MARGINS
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+    baseline = height - bottom
+    y_max = max(values, default=0) or 1
+
+    img = Image.new('RGB', BAR_CHART_SIZE, 'white')
+    draw = ImageDraw.Draw(img)
+    draw.text((width / 2, top / 2), title, fill='black', font=bar_chart_title_font, anchor='mm')
+    draw.text((left - 6, top - 12), 'min', fill='black', font=bar_chart_font, anchor='rd')
+    
+    # Grid lines with minute labels
+    for step in range(5):
+        y = baseline - plot_height * step / 4
+        draw.line((left, y, width - right, y), fill='#dddddd')
+        draw.text((left - 6, y), f"{y_max * step / 4:.1f}", fill='black', font=bar_chart_font, anchor='rm')
+    
+    slot = plot_width / max(len(values), 1)
+    for i, (label, value) in enumerate(zip(labels, values)):
+        x0 = left + slot * (i + 0.15)
+        x1 = left + slot * (i + 0.85)
+        if value > 0:
+            draw.rectangle((x0, baseline - plot_height * value / y_max, x1, baseline), fill=color)
+        draw.text(((x0 + x1) / 2, baseline + 6), label, fill='black', font=bar_chart_font, anchor='mt')
+    
+    draw.line((left, baseline, width - right, baseline), fill='black')
+    draw.line((left, top, left, baseline), fill='black')
+    draw.text((width / 2, height - 6), xlabel, fill='black', font=bar_chart_font, anchor='md')
+    
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', **CHART_PNG_OPTIONS)
+    return buf.getvalue()
+
 async def chart(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Generate response time visualization"""
     user_id = update.effective_user.id
@@ -742,101 +1184,64 @@ async def chart(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        with open(RESPONSE_DATA_FILE, 'r') as f:
-            response_data = json.load(f)
-            
         if is_admin:
-            data_to_analyze = response_data
-            # Create visualization for all workers
-            plt.figure(figsize=(12, 6))
-            plt.clf()  # Clear the current figure
-            
-            # Calculate average response times per worker
+            # Average response times per worker come from the running statistics
             worker_stats = {}
-            for worker_id in set(r['user_id'] for r in data_to_analyze):
-                worker_responses = [r for r in data_to_analyze if r['user_id'] == worker_id]
-                avg_time = sum(float(r['response_delay_seconds']) for r in worker_responses) / len(worker_responses)
-                worker_name = worker_responses[0]['user_name']
-                worker_stats[worker_name] = avg_time / 60  # Convert to minutes
+            for entry in get_response_stats()[0].values():
+                worker_stats[entry['user_name']] = entry['total_delay'] / entry['count'] / 60  # Convert to minutes
             
             # Create bar chart
             workers = list(worker_stats.keys())
             times = list(worker_stats.values())
             
-            plt.bar(workers, times, color='skyblue')
-            plt.title('Average Response Time by Worker')
-            plt.xlabel('Worker Username')
-            plt.ylabel('Average Response Time (minutes)')
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
-            
-            # Save plot to bytes buffer
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-            buf.seek(0)
+            # Render off the event loop so other updates keep being served
+            png_bytes = await run_blocking(
+                render_chart_png, overview_chart, workers, times, 'skyblue',
+                'Average Response Time by Worker', 'Worker Username'
+            )
             
             # Send chart
             await update.message.reply_photo(
-                photo=InputFile(buf, filename='response_times.png'),
+                photo=png_bytes,
+                filename='response_times.png',
                 caption="📊 Average response times for all workers"
             )
-            
-            # Clean up
-            plt.close()
-            buf.close()
         else:
             # For individual workers, show their own stats
+            response_data = await run_blocking(load_response_data)
             data_to_analyze = [r for r in response_data if r['user_id'] == user_id]
             
             if not data_to_analyze:
                 await update.message.reply_text("No response data available.")
                 return
                 
-            plt.figure(figsize=(8, 4))
-            plt.clf()
-            
             # Calculate daily average response times for the last 7 days
-            daily_stats = {}
-            end_date = datetime.now().date()
+            now = get_current_time()
+            end_date = now.date()
             start_date = end_date - timedelta(days=6)
-            
-            current_date = start_date
-            while current_date <= end_date:
-                day_responses = [r for r in data_to_analyze 
-                               if datetime.fromisoformat(r['response_time'].replace('Z', '+00:00')).date() == current_date]
-                if day_responses:
-                    avg_time = sum(float(r['response_delay_seconds']) for r in day_responses) / len(day_responses)
-                    daily_stats[current_date.strftime('%Y-%m-%d')] = avg_time / 60  # Convert to minutes
-                else:
-                    daily_stats[current_date.strftime('%Y-%m-%d')] = 0
-                current_date += timedelta(days=1)
+            # Drop older records by epoch second before pandas converts any dates;
+            # 8 days back always covers local midnight of start_date
+            window_start_ts = int(now.timestamp()) - 8 * 86400
+            recent = [r for r in data_to_analyze if r['response_ts'] >= window_start_ts]
+            daily_stats = daily_average_minutes(recent, start_date, end_date)
             
             # Create bar chart
-            dates = list(daily_stats.keys())
-            times = list(daily_stats.values())
-            
-            plt.bar(dates, times, color='lightgreen')
-            plt.title('Your Average Response Time (Last 7 Days)')
-            plt.xlabel('Date')
-            plt.ylabel('Average Response Time (minutes)')
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
+            dates = [day.strftime('%Y-%m-%d') for day in daily_stats.index]
+            times = daily_stats.tolist()
             
-            # Save plot to bytes buffer
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-            buf.seek(0)
+            # Render off the event loop so other updates keep being served
+            png_bytes = await run_blocking(
+                _render_bar_png, dates, times, 'lightgreen',
+                'Your Average Response Time (Last 7 Days)', 'Date'
+            )
             
             # Send chart
             await update.message.reply_photo(
-                photo=InputFile(buf, filename='response_times.png'),
+                photo=png_bytes,
+                filename='response_times.png',
                 caption="📊 Your response times over the last 7 days"
             )
             
-            # Clean up
-            plt.close()
-            buf.close()
-            
     except Exception as e:
         logger.error(f"Error generating chart: {str(e)}")
         await update.message.reply_text("❌ Error generating chart. Please try again later.")
@@ -850,27 +1255,35 @@ async def add_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Please provide a user ID to add as admin.")
         return
 
-    try:
-        user_id = int(context.args[0])
+    user_ids, invalid = parse_user_ids(context.args)
+    if invalid:
+        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        return
+
+    async with user_lists_lock:
         admin_users = load_admin_users()
         target_users = load_target_users()
         
-        if user_id in admin_users:
-            await update.message.reply_text(f"User {user_id} is already an admin.")
-            return
-            
-        # If user was a worker, remove them from workers list
-        if user_id in target_users:
-            target_users.remove(user_id)
-            save_target_users(target_users)
-            logger.info(f"Removed user {user_id} from workers (promoted to admin)")
-            
-        admin_users.add(user_id)
-        save_admin_users(admin_users)
-        logger.info(f"Added user {user_id} to admin list")
-        await update.message.reply_text(f"✅ User {user_id} added as admin.")
-    except ValueError:
-        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        replies = []
+        added = []
+        for user_id in user_ids:
+            if user_id in admin_users:
+                replies.append(f"User {user_id} is already an admin.")
+            else:
+                added.append(user_id)
+                replies.append(f"✅ User {user_id} added as admin.")
+        
+        if added:
+            # If any of them were workers, remove them from workers list
+            promoted = target_users.intersection(added)
+            if promoted:
+                await run_blocking(save_target_users, target_users - promoted)
+                logger.info(f"Removed users {sorted(promoted)} from workers (promoted to admin)")
+                
+            await run_blocking(save_admin_users, admin_users | set(added))
+            logger.info(f"Added users {added} to admin list")
+    
+    await update.message.reply_text("\n".join(replies))
 
 async def remove_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Remove a user from admin list"""
@@ -881,20 +1294,28 @@ async def remove_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Please provide a user ID to remove from admins.")
         return
 
-    try:
-        user_id = int(context.args[0])
+    user_ids, invalid = parse_user_ids(context.args)
+    if invalid:
+        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        return
+
+    async with user_lists_lock:
         admin_users = load_admin_users()
         
-        if user_id not in admin_users:
-            await update.message.reply_text(f"❌ User {user_id} is not an admin.")
-            return
-            
-        admin_users.remove(user_id)
-        save_admin_users(admin_users)
-        logger.info(f"Removed user {user_id} from admin list")
-        await update.message.reply_text(f"✅ User {user_id} removed from admins.")
-    except ValueError:
-        await update.message.reply_text("❌ Please provide a valid user ID (number).")
+        replies = []
+        removed = []
+        for user_id in user_ids:
+            if user_id not in admin_users:
+                replies.append(f"❌ User {user_id} is not an admin.")
+            else:
+                removed.append(user_id)
+                replies.append(f"✅ User {user_id} removed from admins.")
+        
+        if removed:
+            await run_blocking(save_admin_users, admin_users - set(removed))
+            logger.info(f"Removed users {removed} from admin list")
+    
+    await update.message.reply_text("\n".join(replies))
 
 async def list_admins(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """List all admin users"""
@@ -907,18 +1328,36 @@ async def list_admins(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("📝 No admin users configured.")
         return
         
-    admin_list = []
-    for user_id in sorted(admin_users):
-        try:
-            chat_member = await context.bot.get_chat_member(update.effective_chat.id, user_id)
-            username = f"@{chat_member.user.username}" if chat_member.user.username else chat_member.user.full_name
-            admin_list.append(f"• {user_id} ({username})")
-        except Exception:
-            admin_list.append(f"• {user_id}")
+    admin_list = await describe_chat_members(context, update.effective_chat.id, sorted(admin_users))
     
     message = "👑 Admin users:\n" + "\n".join(admin_list)
     await update.message.reply_text(message)
 
+def remove_old_responses(cutoff_ts):
+    """Drop responses at or before epoch second cutoff_ts; returns (removed, kept) or None if the backup failed"""
+    original_count = 0
+
+    def recent_responses():
+        nonlocal original_count
+        for record in iter_response_data():
+            original_count += 1
+            if record['response_ts'] > cutoff_ts:
+                yield record
+
+    with save_lock:
+        # Save buffered responses first so the cutoff applies to them too
+        # and the stats rebuild below doesn't count removed ones
+        append_response_data(drain_response_buffer())
+        
+        # Create backup before cleanup
+        if not create_backup():
+            return None
+        
+        # Copy the recent responses through to the new file without loading the whole history
+        kept_count = save_response_data(recent_responses())
+        rebuild_response_stats(iter_response_data())
+        return original_count - kept_count, kept_count
+
 async def cleanup_old_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Admin command to clean up old response data"""
     if not await check_admin(update):
@@ -926,27 +1365,21 @@ async def cleanup_old_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
     try:
         days = int(context.args[0]) if context.args else 30
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        # Records store integer epoch seconds, so compare against an integer cutoff
+        cutoff_ts = int(time.time()) - days * 24 * 60 * 60
         
-        with save_lock:
-            data = load_response_data()
-            original_count = len(data)
-            
-            # Filter out old responses
-            data = [r for r in data if datetime.fromisoformat(r['response_time'].replace('Z', '+00:00')) > cutoff_date]
-            
-            # Create backup before cleanup
-            if create_backup():
-                save_response_data(data)
-                removed_count = original_count - len(data)
-                await update.message.reply_text(
-                    f"✅ Cleanup complete:\n"
-                    f"• Removed {removed_count} old responses\n"
-                    f"• Kept {len(data)} responses\n"
-                    f"• Backup created"
-                )
-            else:
-                await update.message.reply_text("❌ Cleanup aborted: backup creation failed")
+        result = await run_blocking(remove_old_responses, cutoff_ts)
+        
+        if result:
+            removed_count, kept_count = result
+            await update.message.reply_text(
+                f"✅ Cleanup complete:\n"
+                f"• Removed {removed_count} old responses\n"
+                f"• Kept {kept_count} responses\n"
+                f"• Backup created"
+            )
+        else:
+            await update.message.reply_text("❌ Cleanup aborted: backup creation failed")
     except Exception as e:
         logger.error(f"Cleanup failed: {e}")
         await update.message.reply_text("❌ Error during cleanup. Check logs for details.")
@@ -958,14 +1391,10 @@ async def list_backups(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
     try:
         backup_info = []
-        for file_type in ['.json', '.xlsx']:
-            files = [(f, os.path.getmtime(os.path.join(BACKUP_DIR, f))) 
-                    for f in os.listdir(BACKUP_DIR) if f.endswith(file_type)]
-            files.sort(key=lambda x: x[1], reverse=True)
-            
+        for file_type, files in scan_backups().items():
             if files:
                 backup_info.append(f"\n{file_type.upper()} Backups:")
-                for filename, mtime in files[:5]:  # Show 5 most recent
+                for filename, mtime in heapq.nlargest(5, files, key=itemgetter(1)):  # Show 5 most recent
                     date = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
                     backup_info.append(f"• {filename} ({date})")
                 backup_info.append(f"Total {file_type} backups: {len(files)}")
@@ -983,17 +1412,20 @@ def main():
     """Start the bot."""
     # Ensure required files exist with proper structure
     default_files = {
-        RESPONSE_DATA_FILE: [],
         MESSAGE_CACHE_FILE: {},
-        TARGET_USERS_FILE: {'target_users': []},
-        ADMIN_USERS_FILE: {'admin_users': []}
+        TARGET_USERS_FILE: [],
+        ADMIN_USERS_FILE: []
     }
     
     for file_path, default_content in default_files.items():
         if not os.path.exists(file_path):
-            with open(file_path, 'w') as f:
-                json.dump(default_content, f, indent=4)
-                logger.debug(f"Created missing file: {file_path}")
+            _atomic_write_json(file_path, default_content)
+            logger.debug(f"Created missing file: {file_path}")
+
+    # Response data is stored as JSON lines, so an empty file is a valid empty log
+    if not os.path.exists(RESPONSE_DATA_FILE):
+        open(RESPONSE_DATA_FILE, 'w').close()
+        logger.debug(f"Created missing file: {RESPONSE_DATA_FILE}")
 
     defaults = Defaults(
         parse_mode='HTML',